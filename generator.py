@@ -11,21 +11,45 @@ Features:
 """
 
 import argparse
+import bisect
 import csv
+import functools
+import html
 import http.server
+import io
+import itertools
 import json
 import multiprocessing
 import os
-import pickle
 import random
-import socketserver
+import re
+import sys
+import tarfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import numpy as np
 import spacy
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("Warning: numba package not found. Syllable counting will use pure Python.")
+    print("Install with: pip install numba")
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    print("Warning: orjson package not found. JSON output will use the standard json module.")
+    print("Install with: pip install orjson")
+
 WORD_SET = [
     "dog", "flower", "windmill", "cliff", "forest", "city", "home", "light", "excess", "clean",
     "crossroads", "horizon", "road", "settlement", "boulder", "outcropping", "signpost", "well",
@@ -71,6 +95,52 @@ WORD_SET += [
     "name", "inscription", "story", "voice", "photo", "ruin", "echo", "trace", "fragment",
     "inheritance", "generation", "reminder", "archive", "dust", "history", "ritual", "memory", "remember"
 ]
+# Each seed word once, so random.choice does not favour the ones listed several times;
+# frozen into a tuple, the fixed pool every fallback seed is drawn from
+WORD_SET = tuple(dict.fromkeys(WORD_SET))
+
+# 128 KiB buffers for the aggregate output files instead of the 8 KiB default
+IO_BUFFER_SIZE = 1 << 17
+
+# Below this many poems, threads cost more than the per-poem file writes they overlap
+PARALLEL_MIN_POEMS = 256
+
+# Poems per batch task: small enough that idle workers pick up the remaining tasks
+# instead of waiting on the slowest one, large enough to keep seed chains going
+BATCH_TASK_POEMS = 50
+
+# spaCy pipeline components never used here: only the tokenizer and the vocab vectors are,
+# plus tok2vec for models without static vectors (see load_nlp)
+UNUSED_PIPES = ["tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+
+# Combined expanded stopwords list, never part of the corpus vocabulary
+_STOPWORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'if', 'then', 'there', 'here', 'that', 'this', 'those',
+                        'these', 'it', 'its', 'is', 'was', 'be', 'been', 'being', 'am', 'are', 'were', 'will', 'would',
+                        'shall', 'should', 'may', 'might', 'must', 'can', 'could', 'you', 'your', 'we', 'our', 'they',
+                        'their', 'he', 'his', 'him', 'she', 'her', 'i', 'my', 'me', 'mine', 'what', 'who', 'whom', 'which',
+                        'where', 'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'some', 'such',
+                        'have', 'got', 'does', 'did', 'was', 'has', 'have', 'had', 'need', 'cause', 'miss',
+                        'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+                        'by', 'now', 'to', 'be', 'not', 'you', 'find', 'ought', 'we', 'they', 'us', 'dare',
+                        'no', 'nor', 'not', 'only', 'own', 'same',
+                        'so', 'than', 'too', 'very', 'let', 'just', 'now', 'ever'})
+
+# Common abbreviations and stems to filter out
+_ABBREVS_AND_STEMS = frozenset({'inc', 'ltd', 'corp', 'cuz', 'cos', 'coz', 'bout', 'doin', 'goin',
+                                'nothin', 'lovin', 'havin', 'fla', 'calif', 'tenn', 'okla', 'wis',
+                                'ind', 'mich', 'mont', 'colo', 'conn', 'bros', 'sen', 'gen', 'mrs',
+                                'gov', 'ariz', 'minn', 'ark', 'ill', 'wash', 'mass', 'dept', 'dist',
+                                'sha', 'kan', 'ala', 'prof', 'ore', 'rep', 'nuff', 'gon', 'deb', 'xdd',
+                                'rev', 'adm', 'nev', 'messrs', 'del', 'kans', 'neb',
+                                'div', 'assn', 'assoc', 'mfg', 'natl', 'intl', 'amer', 'univ', 'tech',
+                                'admin', 'mgr', 'pres', 'dir', 'coord', 'eng', 'sci', 'acct', 'atty'})
+# Everything filtered out of the vocabulary, for a single membership test
+_EXCLUDED_WORDS = _STOPWORDS | _ABBREVS_AND_STEMS
+
+
+# Runs of consecutive vowels
+_VOWEL_GROUP_RE = re.compile('[aeiouy]+')
 
 
 def count_syllables(word: str) -> int:
@@ -84,23 +154,16 @@ def count_syllables(word: str) -> int:
         The estimated number of syllables
     """
     word = word.lower()
-    # Remove non-alphanumeric characters
-    word = ''.join(c for c in word if c.isalnum())
+    # Remove non-alphanumeric characters (most words have none)
+    if not word.isalnum():
+        word = ''.join(c for c in word if c.isalnum())
 
     if not word:
         return 0
 
-    # Count vowel groups as syllables
+    # Count vowel groups as syllables: each run of consecutive vowels is one
     vowels = "aeiouy"
-    # Count consecutive vowels as one syllable
-    count = 0
-    prev_is_vowel = False
-
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not prev_is_vowel:
-            count += 1
-        prev_is_vowel = is_vowel
+    count = len(_VOWEL_GROUP_RE.findall(word))
 
     # Special cases
     if word.endswith('e'):
@@ -113,17 +176,106 @@ def count_syllables(word: str) -> int:
     return count
 
 
+# 1 for the bytes of "aeiouy", 0 elsewhere
+_VOWEL_TABLE = np.array([chr(i) in "aeiouy" for i in range(256)], dtype=np.uint8)
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _count_ascii_syllables(buf):
+        """Same rules as count_syllables, summed over the words of a lowercase ASCII buffer."""
+        total = 0
+        count = 0
+        length = 0
+        prev_is_vowel = False
+        last = before_last = third_last = 0
+        for i in range(len(buf) + 1):
+            char = buf[i] if i < len(buf) else 32
+            # Whitespace as in str.split(): end of word
+            if char == 32 or 9 <= char <= 13 or 28 <= char <= 31:
+                if length:
+                    if last == 101:  # ends with 'e'
+                        count -= 1
+                    if last == 101 and before_last == 108 and length > 2 and not _VOWEL_TABLE[third_last]:
+                        count += 1  # ends with 'le' after a consonant
+                    total += count if count else 1
+                count = 0
+                length = 0
+                prev_is_vowel = False
+                continue
+            # Only alphanumeric characters count
+            if not (48 <= char <= 57 or 97 <= char <= 122):
+                continue
+            is_vowel = _VOWEL_TABLE[char] == 1
+            if is_vowel and not prev_is_vowel:
+                count += 1
+            prev_is_vowel = is_vowel
+            third_last = before_last
+            before_last = last
+            last = char
+            length += 1
+        return total
+
+
 def count_sentence_syllables(sentence: str) -> int:
     """Count the number of syllables in a sentence."""
+    # ASCII sentences go through the compiled byte scan
+    if NUMBA_AVAILABLE and sentence.isascii():
+        return int(_count_ascii_syllables(np.frombuffer(sentence.lower().encode('ascii'), dtype=np.uint8)))
+
     # Split the sentence into words and count syllables for each
     words = sentence.split()
     return sum(count_syllables(word) for word in words)
 
 
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    # Same output as orjson: unescaped UTF-8, compact separators unless indented
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None,
+                      separators=None if indent else (',', ':')).encode('utf-8')
+
+
+def file_fingerprint(path: str) -> List[Any]:
+    """Path, size and modification time of a file, to tell whether data derived from it is stale."""
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def poem_txt_name(poem: Dict[str, Any]) -> str:
+    """File name of a poem saved as text."""
+    return f"poem_{poem['id']}.txt"
+
+
+def format_poem_txt(poem: Dict[str, Any]) -> str:
+    """Text file contents of a poem: its theme, then one line per verse."""
+    return f"Theme: {poem['theme']}\n\n" + "".join(f"{line}\n" for line in poem['lines'])
+
+
+@functools.lru_cache(maxsize=None)
+def load_nlp(nlp_model: str):
+    """Load a spaCy model, downloading it if missing; loaded once per process and model."""
+    print(f"Loading spaCy model: {nlp_model}...")
+    try:
+        nlp = spacy.load(nlp_model, exclude=UNUSED_PIPES)
+    except OSError:
+        print(f"Model {nlp_model} not found. Attempting to download...")
+        import subprocess
+        subprocess.run(["python", "-m", "spacy", "download", nlp_model])
+        nlp = spacy.load(nlp_model, exclude=UNUSED_PIPES)
+
+    # tok2vec only serves models without static vectors (en_core_web_sm...), whose
+    # token vectors are its context tensors
+    if nlp.vocab.vectors_length and "tok2vec" in nlp.pipe_names:
+        nlp.remove_pipe("tok2vec")
+    return nlp
+
+
 class PoemGenerator:
     def __init__(self, input_csv: str, nlp_model: str = "en_core_web_lg", num_poems: int = 20,
                  poem_length: int = 22, output_dir: str = "poems", seed_word: Optional[str] = None,
-                 cache_file: Optional[str] = None):
+                 cache_file: Optional[str] = None, random_seed: Optional[int] = None):
         """
         Initialize the poem generator.
 
@@ -135,17 +287,20 @@ class PoemGenerator:
             output_dir: Directory to save generated poems
             seed_word: Optional starting seed word
             cache_file: File to store vectors
+            random_seed: Optional seed for the random choices, for reproducible runs
         """
-        print(f"Loading spaCy model: {nlp_model}...")
-        try:
-            self.nlp = spacy.load(nlp_model)
-        except OSError:
-            print(f"Model {nlp_model} not found. Attempting to download...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", nlp_model])
-            self.nlp = spacy.load(nlp_model)
+        self.nlp = load_nlp(nlp_model)
+        # Width of the word vectors: the static vectors', or for models without any
+        # the context vectors' computed by tok2vec
+        tensor = self.nlp("a").tensor
+        self.vector_dims = self.nlp.vocab.vectors_length or (tensor.shape[1] if tensor.ndim == 2 else 0)
 
         self.sentences = []
+        self.sentence_syllables = None  # Syllable count of each sentence, aligned with sentences
+        self.sentences_by_syllables = {}  # Syllable count -> ids of the sentences with that count
+        self.word_to_sentences = {}  # Word -> ids of the sentences containing it
+        self.corpus_text = ""  # All sentences joined by NUL, for substring searches
+        self.sentence_starts = []  # Offset of each sentence in corpus_text
         self.sentences_by_user = {}
         self.current_cluster = []
         self.last_related_words = []
@@ -154,15 +309,23 @@ class PoemGenerator:
         self.output_dir = output_dir
         self.input_csv = input_csv
         self.nlp_model = nlp_model
-        self.initial_seed = seed_word if seed_word else random.choice(WORD_SET)
+        self.rng = random.Random(random_seed)  # All random choices, so a seed reproduces a run
+        self.initial_seed = seed_word if seed_word else self.rng.choice(WORD_SET)
         self.poem_cache = {}  # Cache for storing generated poems
-        self.used_sentences = set()  # Track used sentences across poems
+        self.sentence_keys = None  # Id of the first occurrence of each sentence's text
+        self.sentence_key_by_text = {}  # Sentence text -> id of its first occurrence
+        self.used_mask = None  # Track used sentences across poems, indexed by sentence key
+        self.used_count = 0  # Number of distinct sentences used so far
         self.used_themes = set()  # Track used themes to avoid repetition
 
         self.corpus_words = None  # Will store unique content words from corpus
-        self.similarity_cache = {}  # Cache for word similarities
+        self.corpus_index = None  # Corpus words, in the row order of corpus_matrix
+        self.corpus_matrix = None  # Unit-length word vectors stacked as a (words, dims) matrix
+        self.word_to_id = {}  # Corpus word -> row in corpus_matrix
+        self.word_lengths = None  # Length of each corpus word, aligned with corpus_matrix
         self.word_vectors_cache = {}  # Cache for word vectors
         self.related_words_cache = {}  # Cache for related words results
+        self.sentence_index_cache = None  # Sentence indexes loaded from the cache, with the CSV they came from
         self.cache_file = cache_file
 
         if cache_file and os.path.exists(cache_file):
@@ -175,40 +338,67 @@ class PoemGenerator:
         self.load_data(input_csv)
 
     def save_cache(self):
-        """Save word vectors, similarity cache, and related words cache to file"""
+        """Save word vectors, corpus words, and related words cache to file"""
         if not self.cache_file:
             return
 
+        # Vectors go to one contiguous .npy matrix next to the cache file, in float32 as
+        # the model gives them: rounding them would reorder close related-word rankings
+        words = list(self.word_vectors_cache)
+        matrix = np.zeros((len(words), self.vector_dims), dtype=np.float32)
+        for i, word in enumerate(words):
+            matrix[i] = self.word_vectors_cache[word]
+
+        # The sentence indexes go to CACHE.sentences.npz, the postings of every word
+        # concatenated into one array, tagged with the CSV they were built from
+        tokens = list(self.word_to_sentences)
+        postings = [self.word_to_sentences[token] for token in tokens]
+
+        # Everything else is a small JSON index
         cache_data = {
-            'word_vectors': self.word_vectors_cache,
-            'similarity': self.similarity_cache,
-            'corpus_words': self.corpus_words,
-            'related_words': self.related_words_cache
+            'words': words,
+            'corpus_words': sorted(self.corpus_words) if self.corpus_words is not None else None,
+            'related_words': [[word, n, related] for (word, n), related in self.related_words_cache.items()],
+            'sentences': {'csv': file_fingerprint(self.input_csv), 'tokens': tokens}
         }
 
         print(f"Saving cache to {self.cache_file}...")
-        with open(self.cache_file, 'wb') as f:
-            pickle.dump(cache_data, f)
-        print(f"Saved {len(self.word_vectors_cache)} word vectors, {len(self.similarity_cache)} similarity pairs, "
+        np.save(self.cache_file + ".npy", matrix)
+        np.savez(self.cache_file + ".sentences.npz", syllables=self.sentence_syllables,
+                 postings=np.concatenate(postings) if postings else np.zeros(0, dtype=np.int32),
+                 lengths=np.fromiter(map(len, postings), dtype=np.int64, count=len(postings)))
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache_data, f)
+        print(f"Saved {len(self.word_vectors_cache)} word vectors "
               f"and {len(self.related_words_cache)} related words sets")
 
     # Update load_cache to load related_words_cache:
     def load_cache(self):
-        """Load word vectors, similarity cache, and related words cache from file"""
+        """Load word vectors, corpus words, and related words cache from file"""
         if not self.cache_file or not os.path.exists(self.cache_file):
             return
 
         print(f"Loading cache from {self.cache_file}...")
         try:
-            with open(self.cache_file, 'rb') as f:
-                cache_data = pickle.load(f)
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
 
-            self.word_vectors_cache = cache_data.get('word_vectors', {})
-            self.similarity_cache = cache_data.get('similarity', {})
-            self.corpus_words = cache_data.get('corpus_words', None)
-            self.related_words_cache = cache_data.get('related_words', {})
+            # Read the vector matrix in one go instead of rebuilding one object per word:
+            # cached vectors are rows of a single float32 array (older float16 caches
+            # are upcast)
+            matrix = np.load(self.cache_file + ".npy").astype(np.float32, copy=False)
+            self.word_vectors_cache = dict(zip(cache_data['words'], matrix))
 
-            print(f"Loaded {len(self.word_vectors_cache)} word vectors, {len(self.similarity_cache)} similarity pairs, "
+            corpus_words = cache_data.get('corpus_words')
+            self.corpus_words = set(corpus_words) if corpus_words is not None else None
+            self.related_words_cache = {(word, n): related for word, n, related in cache_data.get('related_words', [])}
+
+            sentences = cache_data.get('sentences')
+            if sentences and os.path.exists(self.cache_file + ".sentences.npz"):
+                with np.load(self.cache_file + ".sentences.npz") as arrays:
+                    self.sentence_index_cache = dict(sentences, **arrays)
+
+            print(f"Loaded {len(self.word_vectors_cache)} word vectors "
                   f"and {len(self.related_words_cache)} related words sets")
         except Exception as e:
             print(f"Error loading cache: {e}")
@@ -232,6 +422,47 @@ class PoemGenerator:
                             self.sentences_by_user[user] = []
                         self.sentences_by_user[user].append(sentence)
 
+            # Indexes saved in the cache are reused only if built from this very CSV
+            cached = self.sentence_index_cache
+            if cached is not None and (cached['csv'] != file_fingerprint(csv_path)
+                                       or len(cached['syllables']) != len(self.sentences)):
+                cached = None
+            self.sentence_index_cache = None
+
+            # Inverted index: ids of the sentences containing each word, so make_poem
+            # looks sentences up instead of splitting the whole corpus for every word
+            if cached is not None:
+                ends = np.cumsum(cached['lengths'])
+                self.word_to_sentences = {token: cached['postings'][end - length:end] for token, end, length
+                                          in zip(cached['tokens'], ends.tolist(), cached['lengths'].tolist())}
+            else:
+                word_to_sentences = {}
+                for sid, sentence in enumerate(self.sentences):
+                    for token in set(sentence.split()):
+                        word_to_sentences.setdefault(token, []).append(sid)
+                self.word_to_sentences = {token: np.asarray(ids, dtype=np.int32)
+                                          for token, ids in word_to_sentences.items()}
+
+            # Duplicate sentences share the id of their first occurrence, so using one
+            # marks them all as used
+            first_ids = self.sentence_key_by_text
+            self.sentence_keys = np.fromiter((first_ids.setdefault(s, sid) for sid, s in enumerate(self.sentences)),
+                                             dtype=np.int32, count=len(self.sentences))
+            self.used_mask = np.zeros(len(self.sentences), dtype=bool)
+
+            # One string for substring searches across the corpus
+            self.corpus_text = "\0".join(self.sentences)
+            self.sentence_starts = list(itertools.accumulate((len(s) + 1 for s in self.sentences[:-1]), initial=0))
+
+            # Count syllables once here rather than on every make_poem call
+            if cached is not None:
+                self.sentence_syllables = cached['syllables']
+            else:
+                self.sentence_syllables = np.fromiter((count_sentence_syllables(s) for s in self.sentences),
+                                                      dtype=np.int32, count=len(self.sentences))
+            self.sentences_by_syllables = {int(count): np.flatnonzero(self.sentence_syllables == count).astype(np.int32)
+                                           for count in np.unique(self.sentence_syllables)}
+
             print(f"Loaded {len(self.sentences)} sentences from {len(self.sentences_by_user)} users")
         except Exception as e:
             print(f"Error loading data: {e}")
@@ -245,49 +476,25 @@ class PoemGenerator:
         print("Extracting vocabulary from corpus...")
         start_time = time.time()
 
-        # Combined expanded stopwords list (copied from find_related_words)
-        stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'if', 'then', 'there', 'here', 'that', 'this', 'those',
-                     'these', 'it', 'its', 'is', 'was', 'be', 'been', 'being', 'am', 'are', 'were', 'will', 'would',
-                     'shall', 'should', 'may', 'might', 'must', 'can', 'could', 'you', 'your', 'we', 'our', 'they',
-                     'their', 'he', 'his', 'him', 'she', 'her', 'i', 'my', 'me', 'mine', 'what', 'who', 'whom', 'which',
-                     'where', 'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'some', 'such',
-                     'have', 'got', 'does', 'did', 'was', 'has', 'have', 'had', 'need', 'cause', 'miss',
-                     'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
-                     'by', 'now', 'to', 'be', 'not', 'you', 'find', 'ought', 'we', 'they', 'us', 'dare',
-                     'no', 'nor', 'not', 'only', 'own', 'same',
-                     'so', 'than', 'too', 'very', 'let', 'just', 'now', 'ever'}
-
-        # Common abbreviations and stems to filter out
-        abbrevs_and_stems = {'inc', 'ltd', 'corp', 'cuz', 'cos', 'coz', 'bout', 'doin', 'goin',
-                             'nothin', 'lovin', 'havin', 'fla', 'calif', 'tenn', 'okla', 'wis',
-                             'ind', 'mich', 'mont', 'colo', 'conn', 'bros', 'sen', 'gen', 'mrs',
-                             'gov', 'ariz', 'minn', 'ark', 'ill', 'wash', 'mass', 'dept', 'dist',
-                             'sha', 'kan', 'ala', 'prof', 'ore', 'rep', 'nuff', 'gon', 'deb', 'xdd',
-                             'rev', 'adm', 'nev', 'messrs', 'del', 'kans', 'neb',
-                             'div', 'assn', 'assoc', 'mfg', 'natl', 'intl', 'amer', 'univ', 'tech',
-                             'admin', 'mgr', 'pres', 'dir', 'coord', 'eng', 'sci', 'acct', 'atty'}
-
-        # Combine all sentences into one large text for batch processing
-        all_text = " ".join(self.sentences)
-        doc = self.nlp(all_text)
-        print("Doc generated.")
+        # Tokenize sentence by sentence with every pipeline component disabled: only
+        # lexical token attributes are read. Streaming keeps memory bounded and avoids
+        # spaCy's max_length limit on one huge doc. A single process on purpose:
+        # shipping docs back from n_process workers costs more than tokenizing.
+        docs = self.nlp.pipe(self.sentences, batch_size=256, disable=self.nlp.pipe_names)
         corpus_words = set()
-        for token in doc:
-            token_text_lower = token.text.lower()
-            if (token_text_lower not in stopwords and
-                    token_text_lower not in abbrevs_and_stems and
-                    token.is_alpha and
-                    len(token_text_lower) > 2 and
-                    not token.is_punct and
-                    not token.is_space):
-                corpus_words.add(token_text_lower)
+        for doc in docs:
+            for token in doc:
+                # Cheap flag checks first, then a single set lookup
+                if token.is_alpha and not token.is_punct and not token.is_space:
+                    token_text_lower = token.text.lower()
+                    if len(token_text_lower) > 2 and token_text_lower not in _EXCLUDED_WORDS:
+                        corpus_words.add(token_text_lower)
+        print("Docs tokenized.")
 
         # Also include predefined WORD_SET
         for word in WORD_SET:
             word_lower = word.lower()
-            if (word_lower not in stopwords and
-                    word_lower not in abbrevs_and_stems and
-                    len(word_lower) > 2):
+            if word_lower not in _EXCLUDED_WORDS and len(word_lower) > 2:
                 corpus_words.add(word_lower)
 
         # Store in instance variable
@@ -304,35 +511,59 @@ class PoemGenerator:
         print(f"Extracted {len(corpus_words)} unique content words in {time.time() - start_time:.2f} seconds")
         return corpus_words
 
+    def build_corpus_matrix(self):
+        """Stack the corpus word vectors into one L2-normalized float32 matrix"""
+        if self.corpus_words is None:
+            self.extract_corpus_vocabulary()
+
+        # Sorted for a stable row order across runs (corpus_words is a set)
+        self.corpus_index = sorted(self.corpus_words)
+        self.word_to_id = {word: i for i, word in enumerate(self.corpus_index)}
+        self.word_lengths = np.array([len(word) for word in self.corpus_index], dtype=np.float32)
+        matrix = np.zeros((len(self.corpus_index), self.vector_dims), dtype=np.float32)
+        for i, word in enumerate(self.corpus_index):
+            vector = self.get_vector(word)
+            if vector is not None:
+                matrix[i] = vector
+
+        # Normalize once so a cosine similarity is a plain dot product; words
+        # without a vector keep a zero row and a similarity of 0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        self.corpus_matrix = matrix
+        return matrix
+
     def get_vector(self, word):
         """Get and cache vector for a word"""
         if word in self.word_vectors_cache:
             return self.word_vectors_cache[word]
 
-        doc = self.nlp(word)
-        if len(doc) > 0 and doc[0].has_vector:
-            vector = doc[0].vector
-            self.word_vectors_cache[word] = vector
-            return vector
-        return None
-
-    def compute_similarity(self, word1, word2):
-        """Compute and cache similarity between two words"""
-        # Create a cache key (alphabetically sorted for consistent ordering)
-        cache_key = tuple(sorted([word1, word2]))
-
-        if cache_key in self.similarity_cache:
-            return self.similarity_cache[cache_key]
-
-        vector1 = self.get_vector(word1)
-        vector2 = self.get_vector(word2)
-
-        if vector1 is not None and vector2 is not None:
-            # Calculate cosine similarity directly from vectors
-            similarity = np.dot(vector1, vector2) / (np.linalg.norm(vector1) * np.linalg.norm(vector2))
-            self.similarity_cache[cache_key] = similarity
-            return similarity
-        return 0.0
+        # Models without static vectors: the first token's vector comes from the
+        # pipeline's context tensor, so the word has to go through it
+        if not self.nlp.vocab.vectors_length:
+            doc = self.nlp(word)
+            if len(doc) > 0 and doc[0].has_vector:
+                vector = doc[0].vector
+                self.word_vectors_cache[word] = vector
+                return vector
+            return None
+
+        # Read the vector straight from the vocab, no pipeline run. Only text the
+        # tokenizer could split ("crop field", "cannot") is tokenized, for its first token.
+        vocab = self.nlp.vocab
+        key = word
+        if not (word.isalpha() and word not in self.nlp.tokenizer.rules):
+            doc = self.nlp.make_doc(word)
+            if len(doc) == 0:
+                return None
+            key = doc[0].text
+        if not vocab.has_vector(key):
+            return None
+
+        vector = vocab.get_vector(key)
+        self.word_vectors_cache[word] = vector
+        return vector
 
     def find_related_words(self, word: str, n: int = 15) -> List[str]:
         """
@@ -353,44 +584,42 @@ class PoemGenerator:
             print(f"Using cached related words for '{word}': {related[:15]}")
             return related
 
-        # Process the word to get the lemma
-        doc = self.nlp(word)
-        if not doc or len(doc) == 0:
+        # Nothing to tokenize
+        if not word:
             return []
 
         word_lower = word.lower()
 
-        # Skip processing if word not in vocabulary or has no vector
-        if self.get_vector(word_lower) is None:
+        # Skip processing if word not in vocabulary or has no vector, remembering
+        # the miss so a seed that keeps coming back is not looked up again
+        seed_vector = self.get_vector(word_lower)
+        if seed_vector is None:
             print(f"Word '{word}' has no vector in the vocabulary")
+            self.related_words_cache[cache_key] = []
             return []
 
-        # Make sure corpus words are extracted
-        if self.corpus_words is None:
-            self.extract_corpus_vocabulary()
-
-        # Calculate similarity with batch processing
-        batch_size = 500  # Process words in batches
-        all_similarities = []
-
-        # Process in batches with multiprocessing
-        all_words = list(self.corpus_words)
-        word_batches = [all_words[i:i + batch_size] for i in range(0, len(all_words), batch_size)]
-
-        # Process each batch
-        for batch in word_batches:
-            batch_similarities = []
-            for candidate in batch:
-                if candidate != word_lower:
-                    similarity = self.compute_similarity(word_lower, candidate)
-                    batch_similarities.append((candidate, similarity, len(candidate)))
-            all_similarities.extend(batch_similarities)
-
-        # Sort by similarity with length bonus
-        all_similarities.sort(key=lambda x: (x[1] + (x[2] * 0.01)), reverse=True)
-
-        # Get top candidates
-        result = [word for word, _, _ in all_similarities[:min(n, len(all_similarities))]]
+        # Make sure the corpus matrix is built
+        if self.corpus_matrix is None:
+            self.build_corpus_matrix()
+
+        # Cosine similarity with every corpus word in a single matrix-vector product
+        seed_vector = np.asarray(seed_vector, dtype=np.float32)
+        seed_norm = np.linalg.norm(seed_vector)
+        similarities = self.corpus_matrix @ (seed_vector / seed_norm if seed_norm else seed_vector)
+
+        # Score by similarity with length bonus, leaving out the word itself
+        scores = similarities + self.word_lengths * 0.01
+        if word_lower in self.word_to_id:
+            scores[self.word_to_id[word_lower]] = -np.inf
+        candidates = len(scores) - (word_lower in self.word_to_id)
+
+        # Get top candidates: partition out the best n, then sort only those
+        # (ties by corpus order)
+        top = np.arange(len(scores))
+        if n < candidates:
+            top = np.argpartition(-scores, n)[:n]
+        top = top[np.lexsort((top, -scores[top]))][:min(n, candidates)]
+        result = [self.corpus_index[i] for i in top]
 
         # Cache the result
         self.related_words_cache[cache_key] = result
@@ -398,6 +627,30 @@ class PoemGenerator:
         print(f"Found {len(result)} words related to '{word}': {result[:10]}")
         return result
 
+    def is_used(self, sid) -> bool:
+        """Whether a sentence (or a duplicate of it) was used in a previous poem"""
+        return self.used_mask[self.sentence_keys[sid]]
+
+    def mark_used(self, sid) -> None:
+        """Mark a sentence as used across poems"""
+        key = self.sentence_keys[sid]
+        if not self.used_mask[key]:
+            self.used_mask[key] = True
+            self.used_count += 1
+
+    def sentences_containing(self, word: str) -> List[int]:
+        """Ids of the sentences containing `word` as a substring, in corpus order"""
+        ids = []
+        pos = self.corpus_text.find(word)
+        while pos != -1:
+            sid = bisect.bisect_right(self.sentence_starts, pos) - 1
+            ids.append(sid)
+            # Resume at the next sentence: one hit per sentence is enough
+            if sid + 1 == len(self.sentence_starts):
+                break
+            pos = self.corpus_text.find(word, self.sentence_starts[sid + 1])
+        return ids
+
     def make_poem(self, seed_word: str, feet_pattern: Optional[str] = None) -> tuple[list[str], str]:
         """
         Generate a poem based on a seed word and optional syllable pattern
@@ -409,8 +662,9 @@ class PoemGenerator:
         Returns:
             Tuple of (poem lines, theme word)
         """
-        # Find related words to the seed word
-        related_words = self.find_related_words(seed_word)
+        # Find related words to the seed word (a copy: the list below gets the seed
+        # word added, and the cached one is reused by choose_next_seed)
+        related_words = list(self.find_related_words(seed_word))
 
         # Use the first properly formed related word as the theme (not a partial word)
         theme = seed_word
@@ -447,13 +701,13 @@ class PoemGenerator:
         if feet_targets:
             self.poem_length = len(feet_targets)
 
-        # Pre-calculate syllable counts for sentences to avoid repeated computation
-        sentence_syllables = {}
-        for sentence in self.sentences:
-            sentence_syllables[sentence] = count_sentence_syllables(sentence)
+        # Ids of the sentences containing each related word
+        no_sentences = np.empty(0, dtype=np.int32)
+        related_sentences = [self.word_to_sentences.get(word, no_sentences) for word in related_words]
 
         # Build a cluster of sentences containing those words and matching syllable counts
         cluster = []
+        cluster_set = set()  # Same sentences, for constant-time membership tests
 
         if feet_targets:
             # Determine if this is a strict pattern (like haiku) that needs exact matches
@@ -463,154 +717,154 @@ class PoemGenerator:
             for i, target_syllables in enumerate(feet_targets):
                 target_met = False
 
-                # Try up to 10 times to find an exact match for strict patterns
-                max_retries = 10 if strict_pattern else 3
-                retry_count = 0
-
-                while not target_met and retry_count < max_retries:
-                    retry_count += 1
-
-                    # Set acceptable margin - for strict patterns, require exact match
-                    if strict_pattern:
-                        acceptable_margin = 0  # Exact match required for haiku and short forms
-                    else:
-                        acceptable_margin = 1  # For longer forms, allow ±1 syllable
-
-                    # Try to find a sentence with matching syllable count containing a related word
-                    for word in related_words:
-                        for sentence in self.sentences:
-                            if word in sentence.split() and sentence not in cluster:
-                                # Prioritize unused sentences
-                                if sentence not in self.used_sentences or len(self.used_sentences) > len(
-                                        self.sentences) * 0.7:
-                                    syl_count = sentence_syllables[sentence]
-                                    # Check if within acceptable margin
-                                    if abs(syl_count - target_syllables) <= acceptable_margin:
-                                        cluster.append(sentence)
-                                        self.used_sentences.add(sentence)  # Mark as used
-                                        target_met = True
-                                        break
-                        if target_met:
-                            break
-
-                    # If still no match after multiple tries, gradually relax constraints
-                    if not target_met and retry_count >= max_retries - 1:
-                        acceptable_margin = 1  # Allow ±1 syllable on last try
+                # Set acceptable margin - for strict patterns, require exact match
+                if strict_pattern:
+                    acceptable_margin = 0  # Exact match required for haiku and short forms
+                else:
+                    acceptable_margin = 1  # For longer forms, allow ±1 syllable
+
+                # Sentences within the margin, straight from their syllable-count buckets
+                # (one pass is enough: the search is deterministic, retrying finds nothing new)
+                matching = np.concatenate([self.sentences_by_syllables.get(count, no_sentences)
+                                           for count in range(target_syllables - acceptable_margin,
+                                                              target_syllables + acceptable_margin + 1)])
+
+                # Try to find a sentence with matching syllable count containing a related word
+                for sentence_ids in related_sentences:
+                    for sid in np.intersect1d(sentence_ids, matching, assume_unique=True):
+                        sentence = self.sentences[sid]
+                        if sentence not in cluster_set:
+                            # Prioritize unused sentences
+                            if not self.is_used(sid) or self.used_count > len(self.sentences) * 0.7:
+                                cluster.append(sentence)
+                                cluster_set.add(sentence)
+                                self.mark_used(sid)
+                                target_met = True
+                                break
+                    if target_met:
+                        break
 
                 # If we still couldn't find a matching sentence, use the closest one
                 if not target_met:
-                    best_sentence = None
+                    best_sid = None
                     best_diff = float('inf')
                     best_used = True  # Track if our best match is already used
 
-                    for sentence in self.sentences:
-                        if sentence not in cluster:
-                            for word in related_words:
-                                if word in sentence.split():
-                                    syl_diff = abs(sentence_syllables[sentence] - target_syllables)
-                                    # Prefer unused sentences with a similar syllable count
-                                    is_used = sentence in self.used_sentences
-                                    if (syl_diff < best_diff or (syl_diff == best_diff and is_used < best_used)):
-                                        best_diff = syl_diff
-                                        best_sentence = sentence
-                                        best_used = is_used
-
-                    if best_sentence:
-                        cluster.append(best_sentence)
-                        self.used_sentences.add(best_sentence)  # Mark as used
+                    # Every sentence containing a related word, in corpus order
+                    for sid in np.unique(np.concatenate(related_sentences)):
+                        sentence = self.sentences[sid]
+                        if sentence not in cluster_set:
+                            syl_diff = abs(self.sentence_syllables[sid] - target_syllables)
+                            # Prefer unused sentences with a similar syllable count
+                            is_used = self.is_used(sid)
+                            if (syl_diff < best_diff or (syl_diff == best_diff and is_used < best_used)):
+                                best_diff = syl_diff
+                                best_sid = sid
+                                best_used = is_used
+
+                    if best_sid is not None:
+                        cluster.append(self.sentences[best_sid])
+                        cluster_set.add(self.sentences[best_sid])
+                        self.mark_used(best_sid)
                     else:
                         # If still no match, just find any sentence with close syllable count
-                        for sentence in self.sentences:
-                            if sentence not in cluster:
-                                syl_diff = abs(sentence_syllables[sentence] - target_syllables)
-                                is_used = sentence in self.used_sentences
+                        for sid, sentence in enumerate(self.sentences):
+                            if sentence not in cluster_set:
+                                syl_diff = abs(self.sentence_syllables[sid] - target_syllables)
+                                is_used = self.is_used(sid)
                                 if (syl_diff < best_diff or (syl_diff == best_diff and is_used < best_used)):
                                     best_diff = syl_diff
-                                    best_sentence = sentence
+                                    best_sid = sid
                                     best_used = is_used
 
-                        if best_sentence:
-                            cluster.append(best_sentence)
-                            self.used_sentences.add(best_sentence)  # Mark as used
+                        if best_sid is not None:
+                            cluster.append(self.sentences[best_sid])
+                            cluster_set.add(self.sentences[best_sid])
+                            self.mark_used(best_sid)
         else:
             # Original approach for non-syllable-constrained poems
-            for word in related_words:
-                for sentence in self.sentences:
-                    if word in sentence.split() and sentence not in cluster:
+            for sentence_ids in related_sentences:
+                for sid in sentence_ids:
+                    sentence = self.sentences[sid]
+                    if sentence not in cluster_set:
                         # Only use sentences that haven't been used in previous poems
-                        if sentence not in self.used_sentences:
+                        if not self.is_used(sid):
                             cluster.append(sentence)
-                            self.used_sentences.add(sentence)  # Mark as used
+                            cluster_set.add(sentence)
+                            self.mark_used(sid)
                             if len(cluster) >= self.poem_length:
                                 break
                         # If we're running low on sentences, allow some reuse
-                        elif len(self.used_sentences) > len(self.sentences) * 0.7:
+                        elif self.used_count > len(self.sentences) * 0.7:
                             cluster.append(sentence)
+                            cluster_set.add(sentence)
                             if len(cluster) >= self.poem_length:
                                 break
 
                 if len(cluster) >= self.poem_length:
                     break
 
-            # If we don't have enough sentences, add more from the seed word
+            # If we don't have enough sentences, add more from the seed word, looking
+            # up only the sentences that contain it rather than testing every one
             if len(cluster) < min(self.poem_length, 5):
-                for sentence in self.sentences:
-                    if seed_word in sentence and sentence not in cluster:
+                for sid in self.sentences_containing(seed_word):
+                    sentence = self.sentences[sid]
+                    if sentence not in cluster_set:
                         cluster.append(sentence)
-                        self.used_sentences.add(sentence)  # Mark as used
-                    if len(cluster) >= self.poem_length:
-                        break
+                        cluster_set.add(sentence)
+                        self.mark_used(sid)
+                        if len(cluster) >= self.poem_length:
+                            break
 
         # If we still don't have enough lines, fill in with related sentences
+        if len(cluster) < self.poem_length and len(cluster) < len(self.sentences):
+            # Relevance score: how many related words each sentence contains
+            relevance = np.zeros(len(self.sentences), dtype=np.float64)
+            for word in related_words:
+                relevance[self.sentences_containing(word)] += 1
+            in_cluster = np.isin(self.sentence_keys, [self.sentence_key_by_text[s] for s in cluster_set])
+
         while len(cluster) < self.poem_length and len(cluster) < len(self.sentences):
-            best_sentence = None
-            best_score = -1
-
-            for sentence in self.sentences:
-                if sentence not in cluster:
-                    # Give bonus to unused sentences
-                    sentence_score_multiplier = 2.0 if sentence not in self.used_sentences else 1.0
-                    # Calculate a relevance score
-                    score = 0
-                    for word in related_words:
-                        if word in sentence:
-                            score += 1
-
-                    score *= sentence_score_multiplier
-
-                    if score > best_score:
-                        best_score = score
-                        best_sentence = sentence
-
-            if best_sentence:
-                cluster.append(best_sentence)
-                self.used_sentences.add(best_sentence)
+            # Give bonus to unused sentences, and rule out the ones already in the poem
+            scores = np.where(self.used_mask[self.sentence_keys], relevance, relevance * 2.0)
+            scores[in_cluster] = -1
+            best_sid = int(np.argmax(scores)) if len(scores) and scores.max() >= 0 else None
+
+            if best_sid is not None:
+                in_cluster[self.sentence_keys == self.sentence_keys[best_sid]] = True
+                cluster.append(self.sentences[best_sid])
+                cluster_set.add(self.sentences[best_sid])
+                self.mark_used(best_sid)
             else:
                 # If all else fails, add a random sentence
-                remaining = [s for s in self.sentences if s not in cluster]
+                remaining = [sid for sid, s in enumerate(self.sentences) if s not in cluster_set]
                 if remaining:
-                    random_sentence = random.choice(remaining)
-                    cluster.append(random_sentence)
-                    self.used_sentences.add(random_sentence)
+                    random_sid = self.rng.choice(remaining)
+                    cluster.append(self.sentences[random_sid])
+                    cluster_set.add(self.sentences[random_sid])
+                    in_cluster[self.sentence_keys == self.sentence_keys[random_sid]] = True
+                    self.mark_used(random_sid)
                 else:
                     break
 
         # For syllable-constrained poems, don't shuffle
         if not feet_targets:
-            random.shuffle(cluster)
+            self.rng.shuffle(cluster)
 
         return cluster[:self.poem_length], theme
 
     def choose_next_seed(self, current_seed: str) -> str:
         """Choose the next seed word based on the current one"""
-        related = self.find_related_words(current_seed, n=8)
+        # The top 8 are the head of the default top-n list, which make_poem has just
+        # computed for this seed: slicing the cached list saves a second search
+        related = self.find_related_words(current_seed)[:8]
 
         # If we found related words, choose one at random
         if related:
-            return random.choice(related)
+            return self.rng.choice(related)
 
         # Otherwise choose a random word from our seed set
-        return random.choice(WORD_SET)
+        return self.rng.choice(WORD_SET)
 
     def generate_poem(self, seed_word: Optional[str] = None, feet_pattern: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -624,7 +878,7 @@ class PoemGenerator:
             Dictionary containing poem data
         """
         if not seed_word:
-            seed_word = random.choice(WORD_SET)
+            seed_word = self.rng.choice(WORD_SET)
 
         poem_lines, theme = self.make_poem(seed_word, feet_pattern)
         syllable_counts = [count_sentence_syllables(line) for line in poem_lines]
@@ -688,103 +942,154 @@ class PoemGenerator:
                 current_seed = self.choose_next_seed(current_seed)
             else:
                 # If we couldn't make a poem, try with a different seed
-                current_seed = random.choice(WORD_SET)
+                current_seed = self.rng.choice(WORD_SET)
 
         return all_poems
 
-    def generate_large_batch(self, batch_size: int, workers: int = 4) -> List[Dict[str, Any]]:
+    def generate_large_batch(self, batch_size: int, workers: int = 4, feet_pattern: Optional[str] = None,
+                             seed_word: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Generate a large batch of poems using multiple processes
 
         Args:
             batch_size: Number of poems to generate
             workers: Number of worker processes
+            feet_pattern: Optional pattern of syllables; each poem is then generated on its own
+            seed_word: Optional seed word of each poem with a feet pattern (random by default)
 
         Returns:
             List of poem dictionaries
         """
+        # A feet pattern with a fixed seed word leaves make_poem no randomness: tasks, each
+        # starting with fresh usage tracking, would all return the same poems. Those run
+        # in one process, where every poem avoids the sentences of the previous ones.
+        if feet_pattern and seed_word:
+            workers = 1
+
         print(f"Generating {batch_size} poems using {workers} workers...")
 
         if workers > 1:
+            # Build the corpus matrix and vocabulary once, here: forked workers inherit
+            # them with the loaded model instead of each rebuilding a generator
+            if self.corpus_matrix is None:
+                self.build_corpus_matrix()
+
             # Use multiprocessing for large batches
-            pool = multiprocessing.Pool(processes=workers)
-            poems_per_worker = batch_size // workers
-
-            # Create tasks for each worker
-            tasks = []
-            for i in range(workers):
-                count = poems_per_worker
-                if i == workers - 1:  # last worker gets any remainder
-                    count += batch_size % workers
-                tasks.append(count)
-
-            # Process the tasks
-            results = pool.map(self._worker_generate_poems, tasks)
+            pool = _fork_context().Pool(processes=workers, initializer=_init_worker, initargs=(self,))
+
+            # Split the batch into tasks of BATCH_TASK_POEMS poems (fewer if the batch is
+            # small), handed out to the workers as they become free
+            task_size = max(1, min(BATCH_TASK_POEMS, batch_size // workers))
+            # Each task gets its own random seed: forked workers start with copies of
+            # this generator's random state and would otherwise all draw the same poems
+            tasks = [(min(task_size, batch_size - start), feet_pattern, seed_word, self.rng.getrandbits(64))
+                     for start in range(0, batch_size, task_size)]
+
+            # Process the tasks, combining each task's poems as soon as they arrive
+            # rather than holding every result list until the slowest worker is done,
+            # and renumbering the poem IDs as they are merged. Results come back in
+            # task order, so a random seed reproduces the whole batch.
+            all_poems = []
+            for result in pool.imap(_run_worker, tasks, chunksize=1):
+                for poem in result:
+                    all_poems.append(poem)
+                    poem["id"] = len(all_poems)
+                print(f"Generated {len(all_poems)}/{batch_size} poems")
             pool.close()
             pool.join()
 
-            # Combine results
-            all_poems = []
-            for result in results:
-                all_poems.extend(result)
-
-            # Renumber the poem IDs
-            for i, poem in enumerate(all_poems):
-                poem["id"] = i + 1
-
             return all_poems
         else:
-            # Single process
+            # Single process: one poem at a time with a feet pattern, else one chain
+            if feet_pattern:
+                return self._worker_generate_poems(batch_size, feet_pattern, seed_word)
+            self.num_poems = batch_size
             return self.generate_poems()
 
-    def _worker_generate_poems(self, count: int) -> List[Dict[str, Any]]:
+    def _worker_generate_poems(self, count: int, feet_pattern: Optional[str] = None,
+                               seed_word: Optional[str] = None, random_seed: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Worker function for multiprocessing
 
         Args:
-            count: Number of poems to generate in this worker
+            count: Number of poems to generate in this task
+            feet_pattern: Optional pattern of syllables (e.g., "575" for haiku)
+            seed_word: Optional seed word of each poem with a feet pattern
+            random_seed: Optional seed for this task's random choices
 
         Returns:
             List of poem dictionaries
         """
-        generator = PoemGenerator(
-            input_csv=self.input_csv,
-            nlp_model=self.nlp_model,
-            num_poems=count,
-            poem_length=self.poem_length
-        )
-        return generator.generate_poems()
-
-    def save_poems(self, poems: List[Dict[str, Any]], format: str = "txt") -> None:
+        if random_seed is not None:
+            # A pool task: start from its own seed and fresh usage tracking, so its poems
+            # do not depend on which tasks this worker happened to run before
+            self.rng.seed(random_seed)
+            self.used_mask = np.zeros(len(self.sentences), dtype=bool)
+            self.used_count = 0
+            self.used_themes = set()
+
+        if feet_pattern:
+            return [self.generate_poem(seed_word=seed_word, feet_pattern=feet_pattern) for _ in range(count)]
+
+        # This is the worker's own copy of the generator: each task starts its own chain
+        self.num_poems = count
+        self.initial_seed = self.rng.choice(WORD_SET)
+        return self.generate_poems()
+
+    def write_poem_txt(self, poem: Dict[str, Any]) -> None:
+        """Save one poem to its own text file"""
+        filename = os.path.join(self.output_dir, poem_txt_name(poem))
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(format_poem_txt(poem))
+
+    def save_poems(self, poems: List[Dict[str, Any]], format: str = "txt", pretty_json: bool = False) -> None:
         """
         Save the generated poems to files
 
         Args:
             poems: List of poem dictionaries
-            format: Output format ("txt", "html", or "json")
+            format: Output format ("txt", "tar", "html", or "json"), or several comma-separated
+            pretty_json: Indent poems.json for reading instead of writing it compact
         """
-        if "txt" in format:
-            for poem in poems:
-                txt = f"poem_{poem['id'] if 'id' in poem else '1'}.txt"
-                filename = os.path.join(self.output_dir, txt)
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(f"Theme: {poem['theme']}\n\n")
-                    for line in poem['lines']:
-                        f.write(f"{line}\n")
-                print(f"Saved {txt}", end="\r")
-
-            # Also save all poems to a single file
-            with open(os.path.join(self.output_dir, "all_poems.txt"), 'w', encoding='utf-8') as f:
+        formats = {f.strip().lower() for f in format.split(",") if f.strip()}
+
+        # Poems generated one at a time carry no id: number them by position
+        for i, poem in enumerate(poems):
+            poem.setdefault('id', i + 1)
+
+        if "txt" in formats:
+            # One file per poem: open/write/close release the GIL, so on several cores
+            # large batches overlap them across threads
+            writers = min(16, os.cpu_count() or 1)
+            if writers > 1 and len(poems) >= PARALLEL_MIN_POEMS:
+                with ThreadPoolExecutor(max_workers=writers) as executor:
+                    list(executor.map(self.write_poem_txt, poems))
+            else:
                 for poem in poems:
-                    poem_id = poem['id'] if 'id' in poem else ''
-                    f.write(f"--- Poem {poem_id} (Theme: {poem['theme']}) ---\n")
-                    for line in poem['lines']:
-                        f.write(f"{line}\n")
-                    f.write("\n\n")
+                    self.write_poem_txt(poem)
+
+            # Also save all poems to a single file, assembled in memory and written at once
+            parts = []
+            for poem in poems:
+                parts.append(f"--- Poem {poem['id']} (Theme: {poem['theme']}) ---\n")
+                parts.extend(f"{line}\n" for line in poem['lines'])
+                parts.append("\n\n")
+            with open(os.path.join(self.output_dir, "all_poems.txt"), 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+                f.write("".join(parts))
             print("Saved all_poems.txt")
-        if "html" in format:
+        if "tar" in formats:
+            # The same per-poem text files, in one archive: a single open instead of one per poem
+            with tarfile.open(os.path.join(self.output_dir, "poems.tar"), "w") as tar:
+                for poem in poems:
+                    data = format_poem_txt(poem).encode('utf-8')
+                    info = tarfile.TarInfo(poem_txt_name(poem))
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+                    tar.addfile(info, io.BytesIO(data))
+            print("Saved poems.tar")
+        if "html" in formats:
             # Create a simple HTML output with all poems
-            with open(os.path.join(self.output_dir, "poems.html"), 'w', encoding='utf-8') as f:
+            with open(os.path.join(self.output_dir, "poems.html"), 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
                 f.write("""<!DOCTYPE html>
                     <html>
                     <head>
@@ -824,74 +1129,100 @@ class PoemGenerator:
                     </div>
                     """)
 
+                # Assemble the poems in memory and write them at once; text is escaped
+                # with html.escape (a C-level replace chain, far faster than str.translate)
+                escape = functools.partial(html.escape, quote=False)
+                parts = []
                 for poem in poems:
-                    f.write(f'<div class="poem">\n')
-                    f.write(f'<div class="theme">Theme: {poem["theme"]}</div>\n')
+                    parts.append(f'<div class="poem">\n<div class="theme">Theme: {escape(poem["theme"])}</div>\n')
 
                     # If we have syllable counts, display them
                     if 'syllable_counts' in poem:
-                        for i, (line, count) in enumerate(zip(poem['lines'], poem['syllable_counts'])):
-                            f.write(
-                                f'<div class="line">{line}<span class="syllables">({count} syllables)</span></div>\n')
+                        parts.extend(f'<div class="line">{escape(line)}<span class="syllables">({count} syllables)</span></div>\n'
+                                     for line, count in zip(poem['lines'], poem['syllable_counts']))
                     else:
-                        for line in poem['lines']:
-                            f.write(f'<div class="line">{line}</div>\n')
+                        parts.extend(f'<div class="line">{escape(line)}</div>\n' for line in poem['lines'])
 
-                    f.write('</div>\n')
+                    parts.append('</div>\n')
 
-                f.write("</body></html>")
+                parts.append("</body></html>")
+                f.write("".join(parts))
             print("Saved poems.html")
 
 
-        if "json" in format:
-            # Save as JSON
-            with open(os.path.join(self.output_dir, "poems.json"), 'w', encoding='utf-8') as f:
-                json.dump(poems, f, indent=2)
+        if "json" in formats:
+            # Save as JSON, compact unless asked for the indented form
+            with open(os.path.join(self.output_dir, "poems.json"), 'wb', buffering=IO_BUFFER_SIZE) as f:
+                f.write(dumps_json(poems, indent=pretty_json))
             print("Saved poems.json")
 
-        filtered = [",", "txt", "json", "html"]
-        remaining = format
-        for f in filtered:
-            remaining = remaining.replace(f, "")
-        if len(remaining):
-            print(f"Unknown format {format}...")
+        unknown = formats - {"txt", "tar", "json", "html"}
+        if unknown:
+            print(f"Unknown format {', '.join(sorted(unknown))}...")
         print(f"Saved {len(poems)} poems to {self.output_dir}")
 
 
+# Generator inherited by batch worker processes, set by _init_worker
+_worker_generator = None
+
+
+def _fork_context():
+    """Fork on Linux, so workers share the parent's loaded generator without pickling it"""
+    # Elsewhere keep the platform default: macOS defaults to spawn because forking once
+    # system frameworks are loaded (numpy's Accelerate...) can crash the child. Spawned
+    # workers receive the generator once each, through the pool initializer.
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _init_worker(generator: PoemGenerator) -> None:
+    """Pool initializer: keep the generator handed over by the parent process"""
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _run_worker(task: Tuple[int, Optional[str], Optional[str], int]) -> List[Dict[str, Any]]:
+    """Pool task: generate (count, feet_pattern, seed_word, random_seed) poems with this worker's generator"""
+    return _worker_generator._worker_generate_poems(*task)
+
+
 class PoemHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    """Custom HTTP request handler for serving poems"""
+    """Custom HTTP request handler for serving poems from the server's generator"""
 
-    def __init__(self, *args, generator=None, **kwargs):
-        self.generator = generator
-        super().__init__(*args, **kwargs)
+    def send_json(self, body: bytes):
+        """Send an already serialized JSON body"""
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
     def do_GET(self):
         """Handle GET requests"""
         if self.path == "/poems/" or self.path == "/poems":
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-
-            # Generate poems if not already cached
-            if not hasattr(self.server, "poems") or not self.server.poems:
-                self.server.poems = self.generator.generate_poems()
+            # Generate poems if not already cached, serializing them once along the way:
+            # the whole list for /poems, and each poem on its own for /poem
+            with self.server.lock:
+                if not self.server.poems:
+                    poems = self.server.generator.generate_poems()
+                    self.server.poems_json = dumps_json(poems)
+                    self.server.poem_blobs = [dumps_json(poem) for poem in poems]
+                    self.server.poems = poems
 
             # Send all poems as JSON
-            self.wfile.write(json.dumps(self.server.poems).encode())
+            self.send_json(self.server.poems_json)
 
         elif self.path == "/poem/" or self.path == "/poem":
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-
-            # Generate a new poem or get a random one from cache
-            if hasattr(self.server, "poems") and self.server.poems:
-                poem = random.choice(self.server.poems)
+            # Get a random poem from cache or generate a new one
+            if self.server.poem_blobs:
+                body = self.server.generator.rng.choice(self.server.poem_blobs)
             else:
-                poem = self.generator.generate_poem()
+                with self.server.lock:
+                    body = dumps_json(self.server.generator.generate_poem())
 
             # Send the poem as JSON
-            self.wfile.write(json.dumps(poem).encode())
+            self.send_json(body)
 
         else:
             # Default handler for other paths
@@ -907,50 +1238,20 @@ def run_server(generator, port):
         port: Port number to listen on
     """
 
-    # Create a custom server that holds a reference to the generator
-    class PoemHTTPServer(socketserver.TCPServer):
+    # Create a custom server that holds a reference to the generator; each request
+    # gets its own thread, so cached poems are served while another is generated
+    class PoemHTTPServer(http.server.ThreadingHTTPServer):
+        daemon_threads = True
+
         def __init__(self, server_address, RequestHandlerClass, generator):
             self.generator = generator
+            self.lock = threading.Lock()  # The generator and the cache are shared by request threads
             self.poems = []  # Cache for poems
+            self.poems_json = b""  # The cached poems, serialized once
+            self.poem_blobs = []  # Each cached poem, serialized once
             super().__init__(server_address, RequestHandlerClass)
 
-    # Create a handler class that has access to the generator
-    class Handler(http.server.SimpleHTTPRequestHandler):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-
-        def do_GET(self):
-            if self.path == "/poems/" or self.path == "/poems":
-                self.send_response(200)
-                self.send_header("Content-type", "application/json")
-                self.end_headers()
-
-                # Generate poems if not already cached
-                if not self.server.poems:
-                    self.server.poems = self.server.generator.generate_poems()
-
-                # Send all poems as JSON
-                self.wfile.write(json.dumps(self.server.poems).encode())
-
-            elif self.path == "/poem/" or self.path == "/poem":
-                self.send_response(200)
-                self.send_header("Content-type", "application/json")
-                self.end_headers()
-
-                # Generate a new poem or get a random one from cache
-                if self.server.poems:
-                    poem = random.choice(self.server.poems)
-                else:
-                    poem = self.server.generator.generate_poem()
-
-                # Send the poem as JSON
-                self.wfile.write(json.dumps(poem).encode())
-
-            else:
-                # Default handler for other paths
-                super().do_GET()
-
-    server = PoemHTTPServer("0.0.0.0")
+    server = PoemHTTPServer(("0.0.0.0", port), PoemHTTPRequestHandler, generator)
 
     print(f"Starting server on port {port}...")
     print(f"Access poems at http://localhost:{port}/poems/ or http://localhost:{port}/poem/")
@@ -988,12 +1289,14 @@ def main():
     parser.add_argument("-l", "--length", type=int, default=22, help="Maximum number of lines per poem")
     parser.add_argument("-m", "--model", default="en_core_web_lg", help="spaCy model to use")
     parser.add_argument("-o", "--output-dir", default="poems", help="Directory to save generated poems")
-    parser.add_argument("-f", "--format", type=str, default="txt,json,html", help="Output format (one or more of txt, json, html, comma-separated)")
+    parser.add_argument("-f", "--format", type=str, default="txt,json,html", help="Output format (one or more of txt, tar, json, html, comma-separated)")
+    parser.add_argument("--pretty-json", action="store_true", help="Indent poems.json (default: compact)")
     parser.add_argument("-s", "--seed", default=None, help="Initial seed word for poem generation")
+    parser.add_argument("--random-seed", type=int, default=None, help="Seed for the random choices, for reproducible runs")
     parser.add_argument("-p", "--port", type=int, default=None, help="Run as HTTP server on specified port")
     parser.add_argument("-b", "--batch", type=int, default=None, help="Generate a large batch of poems (specify count)")
     parser.add_argument("-w", "--workers", type=int, default=4, help="Number of worker processes for batch generation")
-    parser.add_argument("--cache", type=str, default=None, help="Cache file for word vectors and similarity")
+    parser.add_argument("--cache", type=str, default=None, help="Cache file for corpus and related words (vectors go to CACHE.npy, sentence indexes to CACHE.sentences.npz)")
     parser.add_argument("-r", "--related", type=str, default=None, help="Test related words")
     parser.add_argument("--feet", type=str, default=None,
                         help="Pattern for syllable counts (e.g., '575' for haiku, '12x4' for alexandrines)")
@@ -1012,7 +1315,8 @@ def main():
         poem_length=args.length,
         output_dir=args.output_dir,
         seed_word=args.seed,
-        cache_file=args.cache
+        cache_file=args.cache,
+        random_seed=args.random_seed
     )
 
     if args.related:
@@ -1028,16 +1332,15 @@ def main():
                 print(f"No related words found for '{word}'")
         return
 
+    # Serve poems over HTTP instead of writing them out
+    elif args.port:
+        run_server(generator, args.port)
+        return
+
     # If batch is specified, generate a large batch
     elif args.batch:
-        # Need to update the generate_large_batch logic to support feet patterns
-        if args.feet:
-            poems = []
-            for _ in range(args.batch):
-                poems.append(generator.generate_poem(seed_word=args.seed, feet_pattern=args.feet))
-        else:
-            poems = generator.generate_large_batch(args.batch, args.workers)
-        generator.save_poems(poems, format=args.format)
+        poems = generator.generate_large_batch(args.batch, args.workers, feet_pattern=args.feet, seed_word=args.seed)
+        generator.save_poems(poems, format=args.format, pretty_json=args.pretty_json)
     # Otherwise, generate regular number of poems
     else:
         if args.feet:
@@ -1047,7 +1350,7 @@ def main():
                 poems.append(poem)
         else:
             poems = generator.generate_poems()
-        generator.save_poems(poems, format=args.format)
+        generator.save_poems(poems, format=args.format, pretty_json=args.pretty_json)
 
     if args.cache:
         generator.save_cache()
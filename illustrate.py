@@ -742,7 +742,7 @@ def main():
     
     # Load poems from JSON file
     try:
-        with open(args.input, 'r') as f:
+        with open(args.input, 'r', encoding='utf-8') as f:
             poems = json.load(f)
         print(f"Loaded {len(poems)} poems from {args.input}")
     except Exception as e: